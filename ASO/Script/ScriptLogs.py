@@ -22,6 +22,11 @@ import psutil
 import json
 import argparse
 import platform
+import re
+import math
+import fcntl
+import tempfile
+from collections import deque
 import paramiko
 
 # ==============================================================================
@@ -45,8 +50,39 @@ UMBRALES = {
     "disk_percent": 95,
     "http_timeout": 10,
     "http_max_time": 3.0,
+    "log_ventana_min": 5,          # Ventana de la primera lectura de una unidad (sin cursor)
+    "log_max_lineas": 5000,        # Tope de líneas leídas por unidad y ejecución
+    "log_max_coincidencias": 5,    # Líneas guardadas por regla (solo las últimas)
+    # Número de coincidencias desde la ejecución anterior a partir del cual se alerta, por regla
+    "log_warn": {"oom": 1, "segfault": 1, "apache_ah": 5, "mariadb_recovery": 1},
+    "log_crit": {"oom": 1, "segfault": 1, "apache_ah": 50, "mariadb_recovery": 1},
 }
 
+# Patrones de error buscados en el journal (una regla por grupo con nombre).
+# Cada patrón se ancla a la única línea que se escribe por evento, para que los
+# contadores cuenten eventos y no líneas:
+# - oom: la línea "Killed process" del kernel o el aviso de systemd en la unidad afectada.
+# - apache_ah: los errores de ejecución de Apache van a /var/log/apache2/error.log;
+#   al journal solo llegan los de arranque/parada, que apache2/apachectl escriben
+#   por stderr sin prefijo "[módulo:nivel]" (p. ej. "AH00526: Syntax error ...").
+#   Se aceptan esas líneas sin nivel, salvo los códigos de aviso de APACHE_AH_AVISOS,
+#   y las que llevan prefijo solo si el nivel es error o superior.
+# - mariadb_recovery: InnoDB escribe "Starting crash recovery" una vez por recuperación.
+# Códigos de Apache de nivel aviso/notice que aparecen en arranques y paradas normales
+APACHE_AH_AVISOS = ["00558", "00094", "00163", "00169", "00171", "00292", "00489", "00491"]
+REGLAS_LOG = {
+    "oom": r"[Oo]ut of memory: Killed process \d+|killed by the OOM killer",
+    "segfault": r"segfault at|general protection fault",
+    "apache_ah": (r"\[[^\]]*:(?:error|crit|alert|emerg)\].*\bAH0\d{4}\b"
+                  r"|^(?!.*\[[^\]]*:(?:warn|notice|info|debug|trace\d)\])"
+                  r".*\bAH(?!(?:" + "|".join(APACHE_AH_AVISOS) + r"):)0\d{4}:"),
+    "mariadb_recovery": r"Starting crash recovery",
+}
+PATRON_REGLAS_LOG = re.compile("|".join(f"(?P<{nombre}>{patron})" for nombre, patron in REGLAS_LOG.items()))
+# Directorio (en el host remoto, relativo al home del usuario SSH) con un cursor
+# de journalctl por unidad, para leer cada entrada una sola vez.
+JOURNAL_CURSORES_DIR = ".cache/monitor_journal"
+
 # Lista de servidores remotos a monitorizar
 SERVIDORES = [
     {"nombre": "Servidor (10.0.2.31)", "ip": "10.0.2.31", "usuario": "ubuntu", "clave_privada": "/home/ubuntu/Proyecto/nube/ansible/Apaches/.ssh/ansible.pem"},
@@ -56,6 +92,16 @@ SERVIDORES = [
 PUERTO_WEB = 80
 LOG_ACCIONES_MANUAL = os.path.join(BASE_DIR, "acciones_manuales.log")
 
+# Rollups SLA: agregados horarios, diarios, mensuales y anuales que se actualizan
+# en cada ejecución automática completa.
+ROLLUPS_PATH = os.path.join(BASE_DIR, "rollups_sla.json")
+ROLLUPS_LOCK_PATH = ROLLUPS_PATH + ".lock"
+ROLLUPS_RETENCION_HORAS = 24 * 31  # Los diarios, mensuales y anuales se conservan siempre
+# Niveles de agregación, de mayor a menor, con el formato de su clave
+NIVELES_ROLLUP = {"anual": "%Y", "mensual": "%Y-%m", "diario": "%Y-%m-%d", "horario": "%Y-%m-%dT%H"}
+# Límites superiores (segundos) de los tramos del histograma de latencia HTTP
+LATENCIA_TRAMOS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0]
+
 # ==============================================================================
 # FUNCIONES AUXILIARES
 # ==============================================================================
@@ -107,6 +153,18 @@ def ejecutar_comando_remoto(ssh, comando):
     except Exception as e:
         return f"Error ejecución remota: {e}"
 
+def leer_lineas_remoto(ssh, comando):
+    # Propósito: recorrer la salida de un comando remoto línea a línea.
+    # Por qué: a diferencia de ejecutar_comando_remoto, no carga toda la salida en
+    # memoria, lo que importa con journals de mucho volumen.
+    # Devuelve el iterador de líneas y una función que, una vez consumido, da el
+    # código de salida y el stderr del comando.
+    stdin, stdout, stderr = ssh.exec_command(comando)
+    lineas = (linea.rstrip("\n") for linea in stdout)
+    def finalizar():
+        return stdout.channel.recv_exit_status(), stderr.read().decode().strip()
+    return lineas, finalizar
+
 # ==============================================================================
 # FUNCIONES DE CHECK
 # ==============================================================================
@@ -179,6 +237,102 @@ def check_recursos_sistema_remoto(ssh):
     except Exception as e:
         return "CRIT", f"Error recursos: {e}"
 
+def check_logs_servicio_remoto(ssh, unidad):
+    # Propósito: buscar patrones de error (OOM, segfault, AH0xxxx, recuperación de
+    # MariaDB) en el journal de una unidad desde la ejecución anterior.
+    # Por qué: las líneas se procesan en streaming con un único regex compilado y
+    # solo se guardan contadores y las últimas coincidencias de cada regla, así
+    # la memoria no crece con el volumen del journal. `unidad="kernel"` lee `-k`,
+    # donde el kernel registra los OOM kills y segfaults.
+    # El cursor de journalctl hace que cada entrada se lea exactamente una vez,
+    # aunque cron se retrase o haya ejecuciones manuales. Junto al cursor se guarda
+    # (`.fin`) el instante hasta el que se analizó, para que las tasas usen el
+    # intervalo real. Con `-n` se leen las primeras entradas tras el cursor: si se
+    # alcanza el tope, el resto queda pendiente para la siguiente ejecución y el
+    # intervalo termina en la última entrada leída.
+    # No se usa `-q`: sin permisos sobre el journal del sistema, journalctl solo
+    # lo indica con un aviso que `-q` suprimiría.
+    ventana = UMBRALES["log_ventana_min"]
+    max_lineas = UMBRALES["log_max_lineas"]
+    selector = "-k" if unidad == "kernel" else f"-u {unidad}"
+    cursor = f"{JOURNAL_CURSORES_DIR}/{unidad}.cursor"
+    marca_fin = f"{JOURNAL_CURSORES_DIR}/{unidad}.fin"
+    cmd = (f"mkdir -p {JOURNAL_CURSORES_DIR} && ahora=$(date +%s); "
+           f"if [ -f {cursor} ]; then desde=''; inicio=$(cat {marca_fin} 2>/dev/null || stat -c %Y {cursor}); "
+           f"else desde='--since=-{ventana}min'; inicio=$((ahora - {ventana * 60})); fi; echo $inicio $ahora; "
+           f"journalctl {selector} --cursor-file={cursor} $desde -n {max_lineas} --no-pager -o short-unix")
+
+    contadores = {regla: 0 for regla in REGLAS_LOG}
+    coincidencias = {regla: deque(maxlen=UMBRALES["log_max_coincidencias"]) for regla in REGLAS_LOG}
+    lineas = 0
+    cabecera = None
+    ultima_marca = None
+    try:
+        lineas_remotas, finalizar = leer_lineas_remoto(ssh, cmd)
+        for linea in lineas_remotas:
+            if cabecera is None:
+                cabecera = linea.split()
+                continue
+            # Separadores de journalctl ("-- No entries --", "-- Boot ... --")
+            if linea.startswith("-- ") and linea.endswith(" --"):
+                continue
+            marca, _, texto = linea.partition(" ")
+            try:
+                ultima_marca = float(marca)
+                lineas += 1
+                linea = f"{datetime.datetime.fromtimestamp(ultima_marca).isoformat(timespec='seconds')} {texto}"
+            except ValueError:
+                pass  # Continuación de un mensaje multilínea
+            m = PATRON_REGLAS_LOG.search(linea)
+            if m:
+                contadores[m.lastgroup] += 1
+                coincidencias[m.lastgroup].append(linea)
+        codigo, error = finalizar()
+    except Exception as e:
+        return "CRIT", f"Error leyendo journal: {e}", {}
+
+    try:
+        inicio, ahora = (int(float(valor)) for valor in cabecera)
+    except (TypeError, ValueError):
+        ahora = int(datetime.datetime.now().timestamp())
+        inicio = ahora - ventana * 60
+    limitado = lineas >= max_lineas and ultima_marca is not None
+    fin = int(ultima_marca) if limitado else ahora
+    segundos = max(fin - inicio, 1)
+    minutos = segundos / 60
+
+    estado = "OK"
+    for regla, cuenta in contadores.items():
+        if cuenta >= UMBRALES["log_crit"][regla]:
+            estado = "CRIT"
+        elif cuenta >= UMBRALES["log_warn"][regla] and estado == "OK":
+            estado = "WARN"
+
+    tasas = {regla: round(cuenta / minutos, 3) for regla, cuenta in contadores.items()}
+    encontrados = [f"{regla}: {cuenta} ({tasas[regla]:.2f}/min)" for regla, cuenta in contadores.items() if cuenta]
+    detalles = f"{', '.join(encontrados) or 'Sin coincidencias'} — {lineas} líneas en {minutos:.1f} min"
+    datos = {"segundos": segundos, "lineas": lineas, "contadores": contadores, "tasas_min": tasas}
+    if limitado:
+        # Por qué: las entradas no leídas no se pierden, pero el análisis va con retraso.
+        datos["retraso_seg"] = max(ahora - fin, 0)
+        detalles += (f" — límite de {max_lineas} líneas alcanzado: el resto queda pendiente "
+                     f"(retraso {datos['retraso_seg'] / 60:.1f} min)")
+        estado = "WARN" if estado == "OK" else estado
+
+    # Por qué: sin permisos sobre el journal la salida queda vacía; igual que
+    # ejecutar_comando_remoto, el stderr se trata como error y no como "sin coincidencias".
+    error = " ".join(error.split())
+    if codigo != 0:
+        estado = "CRIT"
+        detalles = f"Error journalctl (código {codigo}): {error or 'sin detalles'} — {detalles}"
+    else:
+        ejecutar_comando_remoto(ssh, f"echo {fin} > {marca_fin}")
+        if error:
+            estado = "WARN" if estado == "OK" else estado
+            detalles += f" — Aviso journalctl: {error}"
+    datos["coincidencias"] = {regla: list(lineas_r) for regla, lineas_r in coincidencias.items() if lineas_r}
+    return estado, detalles, datos
+
 def obtener_info_sistema_local():
     # Propósito: obtener hostname e IP local (para incluir en informes).
     # Por qué: facilita identificar el origen del informe cuando se revisan logs.
@@ -207,7 +361,12 @@ def monitorizar_servidor(servidor, modo_auto=False, checks_selectivos=None):
     # Por qué: centraliza la lógica de monitorización y determina el estado global.
     ssh = conectar_ssh(servidor)
     if not ssh:
-        return {"estado_global": "CRIT", "checks": {"ssh": {"estado": "CRIT", "detalles": "Conexión SSH fallida"}}}
+        fallo = {"estado_global": "CRIT", "checks": {"ssh": {"estado": "CRIT", "detalles": "Conexión SSH fallida"}},
+                 "servidor": servidor["nombre"]}
+        # Por qué: un servidor inalcanzable también es tiempo sin servicio para el SLA.
+        if modo_auto and checks_selectivos is None:
+            registrar_rollups(fallo, datetime.datetime.now())
+        return fallo
 
     hostname_remoto, ip_remoto = obtener_info_sistema_remoto(ssh)
 
@@ -242,6 +401,12 @@ def monitorizar_servidor(servidor, modo_auto=False, checks_selectivos=None):
         checks["recursos_sistema"] = {"estado": estado_r, "detalles": detalles_r}
         estados.append(estado_r)
 
+    if checks_selectivos is None or "logs" in checks_selectivos:
+        for unidad in instalados + ["kernel"]:
+            estado_l, detalles_l, datos_l = check_logs_servicio_remoto(ssh, unidad)
+            checks[f"logs_{unidad}"] = {"estado": estado_l, "detalles": detalles_l, **datos_l}
+            estados.append(estado_l)
+
     estado_global = "CRIT" if "CRIT" in estados else ("WARN" if "WARN" in estados else "OK")
 
     guardar_resultado({
@@ -250,7 +415,7 @@ def monitorizar_servidor(servidor, modo_auto=False, checks_selectivos=None):
         "servidor": servidor["nombre"],
         "hostname_remoto": hostname_remoto,
         "ip_remoto": ip_remoto
-    }, modo_auto=modo_auto)
+    }, modo_auto=modo_auto, completo=checks_selectivos is None)
 
     ssh.close()
 
@@ -262,7 +427,7 @@ def crear_ruta_salida(fecha_hoy):
     os.makedirs(ruta, exist_ok=True)
     return ruta
 
-def guardar_resultado(resultado, modo_auto=False):
+def guardar_resultado(resultado, modo_auto=False, completo=True):
     # Propósito: serializar y persistir el resultado del check en JSON y texto.
     # Por qué: mantener histórico legible (log) y estructurado (JSON) para análisis.
     ahora = datetime.datetime.now()
@@ -305,6 +470,8 @@ def guardar_resultado(resultado, modo_auto=False):
     ]
     for check, info in resultado["checks"].items():
         lines.append(f"🔹 {check}: {info['estado']} — {info['detalles']}")
+        for regla, lineas_regla in info.get("coincidencias", {}).items():
+            lines.extend(f"     > [{regla}] {linea}" for linea in lineas_regla)
     lines.extend(["-" * 70, f"ESTADO GLOBAL: {resultado['estado_global']}", "=" * 70])
 
     with open(txt_path, 'w', encoding='utf-8') as f:
@@ -314,6 +481,277 @@ def guardar_resultado(resultado, modo_auto=False):
     print(f"\n✅ Informe guardado en: {txt_path}")
     print(f"📊 JSON en: {json_path}\n")
 
+    # Por qué: solo las ejecuciones de cron con todos los checks son muestras a
+    # intervalo fijo; las manuales o selectivas sesgarían el "% del tiempo".
+    # Los informes ya están en disco; un fallo en los rollups no debe perderlos.
+    if modo_auto and completo:
+        registrar_rollups(resultado, ahora)
+
+# ==============================================================================
+# ROLLUPS SLA (AGREGACIÓN INCREMENTAL)
+# ==============================================================================
+# Cada guardado suma su muestra a un bucket horario y a uno diario por servidor
+# y check. Los informes SLA combinan solo esos buckets, sin releer los ficheros
+# de monitorizacion/, por lo que su coste no depende del histórico acumulado.
+
+PATRON_LATENCIA = re.compile(r"tiempo: ([0-9.]+)s")
+PATRON_RECURSOS = re.compile(r"CPU: ([0-9.]+)%, RAM: ([0-9.]+)%, Disco: ([0-9.]+)%")
+
+def bucket_vacio():
+    # Propósito: estructura compacta de un bucket (claves cortas para ahorrar espacio).
+    return {"n": 0, "OK": 0, "WARN": 0, "CRIT": 0}
+
+def acumular_muestra(bucket, check, info):
+    # Propósito: sumar una muestra de un check al bucket.
+    # Por qué: la latencia y los recursos se extraen de `detalles`, que es el
+    # formato que generan check_respuesta_http_remoto y check_recursos_sistema_remoto.
+    estado = info["estado"]
+    bucket["n"] += 1
+    bucket[estado] = bucket.get(estado, 0) + 1
+
+    if check == "respuesta_http":
+        detalles = info.get("detalles", "")
+        m = PATRON_LATENCIA.search(detalles)
+        if m:
+            lat = float(m.group(1))
+            tramo = next((i for i, lim in enumerate(LATENCIA_TRAMOS) if lat <= lim), len(LATENCIA_TRAMOS))
+        elif detalles == "Timeout HTTP":
+            # Por qué: un timeout es la peor latencia posible; se cuenta con el valor
+            # del timeout en el tramo de desbordamiento para que pese en el p95.
+            lat = float(UMBRALES["http_timeout"])
+            tramo = len(LATENCIA_TRAMOS)
+        else:
+            # Errores de conexión: no hay latencia medible, solo se cuentan.
+            bucket["lat_excl"] = bucket.get("lat_excl", 0) + 1
+            lat = None
+        if lat is not None:
+            if "lat_n" not in bucket:
+                bucket.update({"lat_n": 0, "lat_sum": 0.0, "lat_min": lat, "lat_max": lat,
+                               "lat_hist": [0] * (len(LATENCIA_TRAMOS) + 1)})
+            bucket["lat_n"] += 1
+            bucket["lat_sum"] += lat
+            bucket["lat_min"] = min(bucket["lat_min"], lat)
+            bucket["lat_max"] = max(bucket["lat_max"], lat)
+            bucket["lat_hist"][tramo] += 1
+
+    if "contadores" in info:
+        acumular_contadores_log(bucket, info["contadores"], info.get("segundos", 0))
+
+    m = PATRON_RECURSOS.search(info.get("detalles", "")) if check == "recursos_sistema" else None
+    if m:
+        for clave, valor in zip(("cpu_max", "ram_max", "disco_max"), m.groups()):
+            bucket[clave] = max(bucket.get(clave, 0.0), float(valor))
+
+def fusionar_buckets(destino, origen):
+    # Propósito: combinar dos buckets (para sumar varias horas/días en un informe).
+    for clave in ("n", "OK", "WARN", "CRIT"):
+        destino[clave] = destino.get(clave, 0) + origen.get(clave, 0)
+    if "lat_excl" in origen:
+        destino["lat_excl"] = destino.get("lat_excl", 0) + origen["lat_excl"]
+    if "lat_n" in origen:
+        if "lat_n" not in destino:
+            destino.update({"lat_n": 0, "lat_sum": 0.0, "lat_min": origen["lat_min"],
+                            "lat_max": origen["lat_max"], "lat_hist": [0] * len(origen["lat_hist"])})
+        destino["lat_n"] += origen["lat_n"]
+        destino["lat_sum"] += origen["lat_sum"]
+        destino["lat_min"] = min(destino["lat_min"], origen["lat_min"])
+        destino["lat_max"] = max(destino["lat_max"], origen["lat_max"])
+        destino["lat_hist"] = [a + b for a, b in zip(destino["lat_hist"], origen["lat_hist"])]
+    for clave in ("cpu_max", "ram_max", "disco_max"):
+        if clave in origen:
+            destino[clave] = max(destino.get(clave, 0.0), origen[clave])
+    if "log" in origen:
+        acumular_contadores_log(destino, origen["log"], origen["log_seg"])
+
+def acumular_contadores_log(bucket, contadores, segundos):
+    # Propósito: sumar coincidencias por regla y segundos analizados de un check de logs.
+    # Por qué: con ambos totales el informe calcula la tasa de cualquier rango.
+    log = bucket.setdefault("log", {})
+    for regla, cuenta in contadores.items():
+        log[regla] = log.get(regla, 0) + cuenta
+    bucket["log_seg"] = bucket.get("log_seg", 0) + segundos
+
+def percentil_latencia(bucket, percentil=0.95):
+    # Propósito: estimar el percentil a partir del histograma por tramos.
+    # Por qué: el histograma se puede fusionar entre buckets; las muestras crudas no se guardan.
+    objetivo = math.ceil(bucket["lat_n"] * percentil)
+    acumulado = 0
+    for i, cuenta in enumerate(bucket["lat_hist"]):
+        acumulado += cuenta
+        if acumulado >= objetivo:
+            limite = LATENCIA_TRAMOS[i] if i < len(LATENCIA_TRAMOS) else bucket["lat_max"]
+            return min(limite, bucket["lat_max"])
+    return bucket["lat_max"]
+
+def registrar_rollups(resultado, ahora):
+    # Propósito: actualizar los rollups sin interrumpir la monitorización si fallan.
+    try:
+        actualizar_rollups(resultado, ahora)
+    except Exception as e:
+        print(f"⚠️ No se pudieron actualizar los rollups SLA: {e}")
+
+def cargar_rollups():
+    # Propósito: leer los rollups; un fichero inexistente equivale a rollups vacíos.
+    # Un JSON corrupto lanza json.JSONDecodeError para que el llamante decida.
+    try:
+        with open(ROLLUPS_PATH, encoding="utf-8") as f:
+            rollups = json.load(f)
+    except FileNotFoundError:
+        return {nivel: {} for nivel in NIVELES_ROLLUP}
+    # Por qué: ficheros anteriores a los niveles mensual/anual; se reconstruyen
+    # una vez a partir de los diarios, que se conservan siempre.
+    for nivel, longitud in (("mensual", 7), ("anual", 4)):
+        if nivel not in rollups:
+            rollups[nivel] = {}
+            for dia, servidores in rollups["diario"].items():
+                destino = rollups[nivel].setdefault(dia[:longitud], {})
+                for servidor, checks in servidores.items():
+                    for check, bucket in checks.items():
+                        fusionar_buckets(destino.setdefault(servidor, {}).setdefault(check, bucket_vacio()), bucket)
+    return rollups
+
+def actualizar_rollups(resultado, ahora):
+    # Propósito: incorporar el resultado de una ejecución a los rollups de cada nivel.
+    # Por qué: cron y una ejecución manual pueden coincidir; el flock serializa la
+    # lectura-fusión-escritura y el temporal único evita ficheros a medias.
+    os.makedirs(BASE_DIR, exist_ok=True)
+    with open(ROLLUPS_LOCK_PATH, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            rollups = cargar_rollups()
+        except json.JSONDecodeError as e:
+            # Por qué: no se sobrescribe el histórico; se aparta para poder recuperarlo.
+            apartado = f"{ROLLUPS_PATH}.corrupto_{ahora.strftime('%Y%m%d_%H%M%S')}"
+            os.replace(ROLLUPS_PATH, apartado)
+            print(f"⚠️ Rollups SLA corruptos ({e}); movidos a {apartado}")
+            rollups = {nivel: {} for nivel in NIVELES_ROLLUP}
+        fusionar_resultado(rollups, resultado, ahora)
+
+        # Por qué: NamedTemporaryFile crea el fichero con modo 0600 y os.replace lo
+        # conservaría, impidiendo que otros operadores lancen --report.
+        f = tempfile.NamedTemporaryFile("w", dir=BASE_DIR, delete=False, encoding="utf-8")
+        try:
+            with f:
+                json.dump(rollups, f, separators=(",", ":"), ensure_ascii=False)
+            os.chmod(f.name, 0o644)
+            os.replace(f.name, ROLLUPS_PATH)
+        except Exception:
+            os.unlink(f.name)
+            raise
+
+def fusionar_resultado(rollups, resultado, ahora):
+    # Propósito: sumar los checks de un resultado a sus buckets y podar los horarios antiguos.
+    servidor = resultado.get("servidor") or resultado["hostname_remoto"]
+    claves = {nivel: ahora.strftime(formato) for nivel, formato in NIVELES_ROLLUP.items()}
+
+    muestras = {check: info for check, info in resultado["checks"].items() if info["estado"] != "INFO"}
+    muestras["estado_global"] = {"estado": resultado["estado_global"]}
+
+    for nivel, clave in claves.items():
+        por_servidor = rollups.setdefault(nivel, {}).setdefault(clave, {}).setdefault(servidor, {})
+        for check, info in muestras.items():
+            acumular_muestra(por_servidor.setdefault(check, bucket_vacio()), check, info)
+
+    limite = (ahora - datetime.timedelta(hours=ROLLUPS_RETENCION_HORAS)).strftime("%Y-%m-%dT%H")
+    rollups["horario"] = {k: v for k, v in rollups["horario"].items() if k >= limite}
+
+def truncar_fecha(fecha, nivel):
+    # Propósito: inicio del bucket de `nivel` que contiene `fecha`.
+    if nivel == "anual":
+        return fecha.replace(month=1, day=1, hour=0)
+    if nivel == "mensual":
+        return fecha.replace(day=1, hour=0)
+    if nivel == "diario":
+        return fecha.replace(hour=0)
+    return fecha
+
+def inicio_siguiente(fecha, nivel):
+    # Propósito: inicio del bucket de `nivel` posterior al que contiene `fecha`.
+    # Por qué: al final del calendario (año 9999) no hay bucket siguiente; se usa
+    # datetime.max como cota en lugar de dejar escapar el OverflowError.
+    fecha = truncar_fecha(fecha, nivel)
+    try:
+        if nivel == "anual":
+            return fecha.replace(year=fecha.year + 1)
+        if nivel == "mensual":
+            return (fecha + datetime.timedelta(days=32)).replace(day=1)
+        if nivel == "diario":
+            return fecha + datetime.timedelta(days=1)
+        return fecha + datetime.timedelta(hours=1)
+    except (OverflowError, ValueError):
+        return datetime.datetime.max
+
+def claves_rango(desde, hasta):
+    # Propósito: cubrir un rango (inclusive) con el menor número de buckets.
+    # Por qué: se usa el bucket más grande (anual, mensual, diario, horario) que
+    # encaje entero en lo que queda del rango, así que un rango de años necesita
+    # unas pocas decenas de buckets en los bordes más uno por año, no uno por día.
+    # El formato de la fecha elige la granularidad: YYYY-MM-DD o YYYY-MM-DDTHH.
+    formato, nivel_minimo = ("%Y-%m-%dT%H", "horario") if "T" in desde else ("%Y-%m-%d", "diario")
+    inicio = datetime.datetime.strptime(desde, formato)
+    fin = inicio_siguiente(datetime.datetime.strptime(hasta, formato), nivel_minimo)
+    claves = []
+    while inicio < fin:
+        for nivel, formato_clave in NIVELES_ROLLUP.items():
+            siguiente = inicio_siguiente(inicio, nivel)
+            if truncar_fecha(inicio, nivel) == inicio and siguiente <= fin:
+                break
+        claves.append((nivel, inicio.strftime(formato_clave)))
+        inicio = siguiente
+    return claves
+
+def informe_sla(desde=None, hasta=None):
+    # Propósito: imprimir el resumen SLA de un rango combinando solo los rollups.
+    desde = desde or datetime.datetime.now().strftime("%Y-%m-%d")
+    hasta = hasta or desde
+    try:
+        claves = claves_rango(desde, hasta)
+    except ValueError:
+        print("❌ Formato de fecha no válido (usa YYYY-MM-DD o YYYY-MM-DDTHH, el mismo en --desde y --hasta).")
+        return
+    try:
+        rollups = cargar_rollups()
+    except json.JSONDecodeError as e:
+        print(f"❌ {ROLLUPS_PATH} está corrupto: {e}")
+        return
+
+    limite = (datetime.datetime.now() - datetime.timedelta(hours=ROLLUPS_RETENCION_HORAS)).strftime("%Y-%m-%dT%H")
+    caducadas = [clave for nivel, clave in claves if nivel == "horario" and clave < limite]
+
+    totales = {}
+    for nivel, clave in claves:
+        for servidor, checks in rollups[nivel].get(clave, {}).items():
+            for check, bucket in checks.items():
+                fusionar_buckets(totales.setdefault(servidor, {}).setdefault(check, bucket_vacio()), bucket)
+
+    print("\n" + "=" * 70)
+    print(f"INFORME SLA: {desde} → {hasta} ({len(claves)} buckets)")
+    print("=" * 70)
+    if caducadas:
+        print(f"⚠️ {len(caducadas)} horas del rango superan la retención horaria "
+              f"({ROLLUPS_RETENCION_HORAS // 24} días); los datos de esas horas están incompletos.")
+    if not totales:
+        print("⚠️ No hay datos agregados para ese rango.\n")
+        return
+    for servidor, checks in sorted(totales.items()):
+        print(f"\n🖥  {servidor}")
+        for check, b in sorted(checks.items()):
+            pct = {e: 100.0 * b[e] / b["n"] for e in ("OK", "WARN", "CRIT")}
+            linea = f"🔹 {check}: OK {pct['OK']:.1f}% | WARN {pct['WARN']:.1f}% | CRIT {pct['CRIT']:.1f}% ({b['n']} muestras)"
+            if "lat_n" in b:
+                linea += (f" — latencia min/avg/p95: {b['lat_min']:.2f}/{b['lat_sum'] / b['lat_n']:.2f}"
+                          f"/{percentil_latencia(b):.2f}s")
+            if "lat_excl" in b:
+                linea += f" ({b['lat_excl']} errores HTTP sin latencia)"
+            if "cpu_max" in b:
+                linea += f" — máx CPU {b['cpu_max']:.1f}%, RAM {b['ram_max']:.1f}%, Disco {b['disco_max']:.1f}%"
+            if "log" in b:
+                minutos = max(b["log_seg"], 1) / 60
+                linea += " — " + (", ".join(f"{regla} {cuenta} ({cuenta / minutos:.3f}/min)"
+                                            for regla, cuenta in b["log"].items() if cuenta) or "sin coincidencias en logs")
+            print(linea)
+    print()
+
 # ==============================================================================
 # MENÚ INTERACTIVO (SOLO SE MODIFICÓ LA OPCIÓN 3 y 5)
 # ==============================================================================
@@ -353,13 +791,13 @@ def menu_interactivo():
             sel_srv = int(input("Número (0 para todos): ")) 
             if sel_srv == 0:
                 for servidor in SERVIDORES:
-                    print("\nSelecciona checks para " + servidor['nombre'] + " (separados por coma, o 'todos'): servicios, puerto, http, recursos")
+                    print("\nSelecciona checks para " + servidor['nombre'] + " (separados por coma, o 'todos'): servicios, puerto, http, recursos, logs")
                     checks_input = input("Checks: ").strip()
                     checks_selectivos = None if checks_input.lower() == "todos" else [c.strip() for c in checks_input.split(",")]
                     monitorizar_servidor(servidor, modo_auto=False, checks_selectivos=checks_selectivos)
             else:
                 servidor = SERVIDORES[sel_srv - 1]
-                print("\nSelecciona checks (separados por coma, o 'todos'): servicios, puerto, http, recursos")
+                print("\nSelecciona checks (separados por coma, o 'todos'): servicios, puerto, http, recursos, logs")
                 checks_input = input("Checks: ").strip()
                 checks_selectivos = None if checks_input.lower() == "todos" else [c.strip() for c in checks_input.split(",")]
                 monitorizar_servidor(servidor, modo_auto=False, checks_selectivos=checks_selectivos)
@@ -482,9 +920,14 @@ def main():
     # Propósito: punto de entrada; soporta modo automático para cron o modo interactivo.
     parser = argparse.ArgumentParser(description="Monitor avanzado de servicios críticos")
     parser.add_argument('--auto', action='store_true', help="Modo automático para cron")
+    parser.add_argument('--report', action='store_true', help="Mostrar resumen SLA a partir de los rollups")
+    parser.add_argument('--desde', help="Inicio del rango: YYYY-MM-DD (diario) o YYYY-MM-DDTHH (horario). Por defecto hoy")
+    parser.add_argument('--hasta', help="Fin del rango, mismo formato que --desde. Por defecto igual a --desde")
     args = parser.parse_args()
 
-    if args.auto:
+    if args.report:
+        informe_sla(args.desde, args.hasta)
+    elif args.auto:
         print("▶ Modo automático ejecutándose...")
         for servidor in SERVIDORES:
             monitorizar_servidor(servidor, modo_auto=True)